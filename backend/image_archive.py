@@ -0,0 +1,114 @@
+import hashlib
+import os
+import logging
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (256, 256)
+THUMBNAIL_QUALITY = 80
+
+def content_hash(image_bytes: bytes) -> str:
+    """SHA-256 hex digest used as the archive key for an upload"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+class ImageArchive:
+    def __init__(self, root: Path):
+        """
+        Content-addressed store for uploaded images.
+        Each unique image is kept once as <root>/<h[:2]>/<h[2:4]>/<h>,
+        with its WebP thumbnail alongside as <h>.webp.
+        """
+        self.root = Path(root)
+        logger.info(f"Image archive initialized at {self.root}")
+
+    def _shard_dir(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4]
+
+    def image_path(self, digest: str) -> Path:
+        return self._shard_dir(digest) / digest
+
+    def thumbnail_path(self, digest: str) -> Path:
+        return self._shard_dir(digest) / f"{digest}.webp"
+
+    def has_thumbnail(self, digest: str) -> bool:
+        """Whether a thumbnail is already archived; unreadable archives count as missing"""
+        try:
+            return self.thumbnail_path(digest).exists()
+        except OSError:
+            return False
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write to a temp file in the target directory, then rename into place"""
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            # mkstemp creates 0600 files; archived images must stay readable for audits
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def store(self, digest: str, image_bytes: bytes, thumbnail: Optional[Image.Image] = None) -> None:
+        """
+        Persist an upload and its thumbnail unless already archived.
+        Intended to run as a background task; errors are logged, not raised.
+        """
+        try:
+            self._shard_dir(digest).mkdir(parents=True, exist_ok=True)
+
+            image_path = self.image_path(digest)
+            if not image_path.exists():
+                self._write_atomic(image_path, image_bytes)
+
+            thumb_path = self.thumbnail_path(digest)
+            if thumbnail is not None and not thumb_path.exists():
+                buffer = BytesIO()
+                thumbnail.save(buffer, format="WEBP", quality=THUMBNAIL_QUALITY)
+                self._write_atomic(thumb_path, buffer.getvalue())
+        except Exception as e:
+            logger.error(f"Image archive write failed for {digest}: {e}")
+
+image_archive = None
+
+def get_image_archive() -> ImageArchive:
+    """Dependency for obtaining the image archive instance"""
+    global image_archive
+    if image_archive is None:
+        default_root = Path(__file__).parent / "data" / "images"
+        image_archive = ImageArchive(Path(os.environ.get('IMAGE_ARCHIVE_DIR', default_root)))
+    return image_archive
+
+def _resolve_archive(digest: str) -> Optional[ImageArchive]:
+    """Return the archive, or None (logged) if it cannot be set up"""
+    try:
+        return get_image_archive()
+    except Exception as e:
+        logger.error(f"Image archive unavailable, skipping {digest}: {e}")
+        return None
+
+def thumbnail_archived(digest: str) -> bool:
+    """
+    Whether a thumbnail for digest already exists.
+    Touches the filesystem, so callers in async code should run it in a threadpool.
+    """
+    archive = _resolve_archive(digest)
+    return archive is not None and archive.has_thumbnail(digest)
+
+def archive_upload(digest: str, image_bytes: bytes, thumbnail: Optional[Image.Image] = None) -> None:
+    """
+    Background task entry point: resolves the archive and stores the upload.
+    Archive failures are logged so they can never fail a prediction.
+    """
+    archive = _resolve_archive(digest)
+    if archive is not None:
+        archive.store(digest, image_bytes, thumbnail)
@@ -5,6 +5,7 @@ import os
 import logging
 import keras
 from pathlib import Path
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -39,10 +40,14 @@ class PlantDiseaseModel:
             
         logger.info(f"Model initialized with {len(self.disease_classes)} disease classes")
     
-    def preprocess_image(self, image_bytes: bytes) -> np.ndarray:
+    def preprocess_image(
+        self, image_bytes: bytes, thumbnail_size: Optional[Tuple[int, int]] = None
+    ) -> Tuple[np.ndarray, Optional[Image.Image]]:
         """
         Preprocess image for model inference.
         Handles image loading, resizing, and normalization.
+        If thumbnail_size is given, also returns a downsized copy of the
+        decoded image so callers need not decode the upload again.
         """
         try:
             image = Image.open(BytesIO(image_bytes))
@@ -50,6 +55,14 @@ class PlantDiseaseModel:
             if image.mode != 'RGB':
                 image = image.convert('RGB')
             
+            thumbnail = None
+            if thumbnail_size is not None:
+                # Single reducing resize instead of copy()+thumbnail(), so the
+                # full-resolution image is never duplicated in memory
+                scale = min(1.0, thumbnail_size[0] / image.width, thumbnail_size[1] / image.height)
+                target = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+                thumbnail = image.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
             image = image.resize(self.input_size, Image.Resampling.LANCZOS)
             img_array = np.array(image, dtype=np.float32)
             # Normalization might depend on how the model was trained, 
@@ -57,19 +70,20 @@ class PlantDiseaseModel:
             img_array = img_array / 255.0
             img_array = np.expand_dims(img_array, axis=0)
             
-            return img_array
+            return img_array, thumbnail
         except Exception as e:
             raise ValueError(f"Error preprocessing image: {e}")
     
-    def predict(self, image_bytes: bytes) -> dict:
+    def predict(self, image_bytes: bytes, thumbnail_size: Optional[Tuple[int, int]] = None) -> dict:
         """
         Make prediction on uploaded image using the actual Keras model.
+        If thumbnail_size is given, the result includes a "thumbnail" PIL image.
         """
         try:
             if self.model is None:
                 raise ValueError("Model not loaded correctly")
                 
-            processed_image = self.preprocess_image(image_bytes)
+            processed_image, thumbnail = self.preprocess_image(image_bytes, thumbnail_size)
             
             predictions = self.model.predict(processed_image, verbose=0)
             
@@ -86,12 +100,15 @@ class PlantDiseaseModel:
             ]
             all_predictions.sort(key=lambda x: x["confidence"], reverse=True)
             
-            return {
+            result = {
                 "predicted_disease": predicted_class,
                 "confidence": confidence,
                 "all_predictions": all_predictions[:5],
                 "success": True
             }
+            if thumbnail is not None:
+                result["thumbnail"] = thumbnail
+            return result
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             return {
@@ -1,7 +1,8 @@
-from fastapi import FastAPI, APIRouter, File, UploadFile, HTTPException, status
+from fastapi import FastAPI, APIRouter, BackgroundTasks, File, UploadFile, HTTPException, status
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
@@ -11,6 +12,7 @@ from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
 from ml.model import get_model
+from image_archive import archive_upload, content_hash, thumbnail_archived, THUMBNAIL_SIZE
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -34,6 +36,7 @@ class PredictionResponse(BaseModel):
     
     prediction_id: str
     filename: str
+    image_sha256: str
     predicted_disease: str
     confidence: float
     all_predictions: List[dict]
@@ -43,6 +46,7 @@ class PredictionHistory(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
     filename: str
+    image_sha256: Optional[str] = None
     predicted_disease: str
     confidence: float
     timestamp: str
@@ -79,10 +83,11 @@ async def root():
     return {"message": "AgriScan AI - Plant Disease Detection API", "version": "1.0"}
 
 @api_router.post("/predictions/predict")
-async def predict_disease(file: UploadFile = File(...)):
+async def predict_disease(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Accept image upload and return disease prediction.
     Validates file, processes image, runs model inference, and stores result in MongoDB.
+    The upload and its thumbnail are archived by content hash after the response is sent.
     """
     try:
         await validate_upload_file(file)
@@ -95,8 +100,15 @@ async def predict_disease(file: UploadFile = File(...)):
                 detail=f"File size exceeds maximum allowed size of 25MB"
             )
         
+        # Retries of an already-archived photo skip thumbnailing entirely
+        image_sha256 = content_hash(file_content)
+        needs_thumbnail = not await run_in_threadpool(thumbnail_archived, image_sha256)
+        
         model = get_model()
-        prediction_result = model.predict(file_content)
+        prediction_result = model.predict(
+            file_content,
+            thumbnail_size=THUMBNAIL_SIZE if needs_thumbnail else None
+        )
         
         if not prediction_result.get("success"):
             raise HTTPException(
@@ -104,12 +116,20 @@ async def predict_disease(file: UploadFile = File(...)):
                 detail=prediction_result.get("error", "Prediction failed")
             )
         
+        background_tasks.add_task(
+            archive_upload,
+            image_sha256,
+            file_content,
+            prediction_result.pop("thumbnail", None)
+        )
+        
         prediction_id = str(uuid.uuid4())
         timestamp = datetime.now(timezone.utc)
         
         prediction_doc = {
             "prediction_id": prediction_id,
             "filename": file.filename,
+            "image_sha256": image_sha256,
             "timestamp": timestamp.isoformat(),
             "predicted_disease": prediction_result["predicted_disease"],
             "confidence": prediction_result["confidence"],
@@ -124,6 +144,7 @@ async def predict_disease(file: UploadFile = File(...)):
             content={
                 "prediction_id": prediction_id,
                 "filename": file.filename,
+                "image_sha256": image_sha256,
                 "predicted_disease": prediction_result["predicted_disease"],
                 "confidence": round(prediction_result["confidence"], 4),
                 "all_predictions": prediction_result["all_predictions"],
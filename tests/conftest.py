@@ -0,0 +1,15 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# The backend is not a package: server.py imports its siblings as top-level
+# modules (`ml.model`, `image_archive`), so put backend/ on the path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def stub_keras(monkeypatch):
+    """ml.model imports keras at module level but preprocessing never uses it"""
+    monkeypatch.setitem(sys.modules, "keras", types.ModuleType("keras"))
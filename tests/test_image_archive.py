@@ -0,0 +1,91 @@
+import logging
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from image_archive import ImageArchive, THUMBNAIL_SIZE, content_hash
+
+
+def make_image_bytes(size=(640, 480), color="green") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_store_writes_sharded_image_and_thumbnail(tmp_path):
+    archive = ImageArchive(tmp_path)
+    image_bytes = make_image_bytes()
+    digest = content_hash(image_bytes)
+
+    archive.store(digest, image_bytes, Image.new("RGB", (64, 48)))
+
+    shard = tmp_path / digest[:2] / digest[2:4]
+    assert (shard / digest).read_bytes() == image_bytes
+    with Image.open(shard / f"{digest}.webp") as thumb:
+        assert thumb.format == "WEBP"
+    assert (shard / digest).stat().st_mode & 0o777 == 0o644
+    assert archive.has_thumbnail(digest)
+
+
+def test_store_skips_already_archived_digest(tmp_path, monkeypatch):
+    archive = ImageArchive(tmp_path)
+    image_bytes = make_image_bytes()
+    digest = content_hash(image_bytes)
+    archive.store(digest, image_bytes, Image.new("RGB", (64, 48)))
+
+    writes = []
+    monkeypatch.setattr(archive, "_write_atomic", lambda path, data: writes.append(path))
+    archive.store(digest, image_bytes, Image.new("RGB", (64, 48)))
+
+    assert writes == []
+
+
+def test_store_logs_write_failure(tmp_path, caplog):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_bytes(b"")
+    archive = ImageArchive(blocker)
+    image_bytes = make_image_bytes()
+    digest = content_hash(image_bytes)
+
+    with caplog.at_level(logging.ERROR, logger="image_archive"):
+        archive.store(digest, image_bytes)
+
+    assert f"Image archive write failed for {digest}" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "size, mode, expected",
+    [
+        ((1200, 400), "RGB", (256, 85)),
+        ((1200, 400), "RGBA", (256, 85)),
+        ((300, 300), "P", (256, 256)),
+        ((1, 5000), "RGB", (1, 256)),
+        ((100, 50), "RGB", (100, 50)),
+    ],
+)
+def test_preprocess_image_thumbnail_fits_thumbnail_size(stub_keras, size, mode, expected):
+    from ml.model import PlantDiseaseModel
+
+    model = PlantDiseaseModel.__new__(PlantDiseaseModel)
+    model.input_size = (224, 224)
+    buffer = BytesIO()
+    Image.new(mode, size).save(buffer, format="PNG")
+
+    img_array, thumbnail = model.preprocess_image(buffer.getvalue(), thumbnail_size=THUMBNAIL_SIZE)
+
+    assert img_array.shape == (1, 224, 224, 3)
+    assert thumbnail.mode == "RGB"
+    assert thumbnail.size == expected
+    assert thumbnail.width <= THUMBNAIL_SIZE[0] and thumbnail.height <= THUMBNAIL_SIZE[1]
+
+
+def test_preprocess_image_without_thumbnail_size(stub_keras):
+    from ml.model import PlantDiseaseModel
+
+    model = PlantDiseaseModel.__new__(PlantDiseaseModel)
+    model.input_size = (224, 224)
+
+    _, thumbnail = model.preprocess_image(make_image_bytes())
+
+    assert thumbnail is None
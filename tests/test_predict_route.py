@@ -0,0 +1,107 @@
+import hashlib
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+
+class FakeModel:
+    def __init__(self):
+        self.thumbnail_sizes = []
+
+    def predict(self, image_bytes, thumbnail_size=None):
+        self.thumbnail_sizes.append(thumbnail_size)
+        result = {
+            "predicted_disease": "Tomato___healthy",
+            "confidence": 0.9,
+            "all_predictions": [{"class": "Tomato___healthy", "confidence": 0.9}],
+            "success": True
+        }
+        if thumbnail_size is not None:
+            result["thumbnail"] = Image.new("RGB", (8, 8))
+        return result
+
+
+class FakeCollection:
+    def __init__(self, events):
+        self.events = events
+        self.docs = []
+
+    async def insert_one(self, doc):
+        self.events.append("insert")
+        self.docs.append(doc)
+
+
+class FakeDB:
+    def __init__(self, events):
+        self.predictions = FakeCollection(events)
+
+
+@pytest.fixture
+def route(stub_keras, monkeypatch):
+    import server
+
+    events = []
+    archived = []
+    model = FakeModel()
+    db = FakeDB(events)
+
+    def fake_archive_upload(digest, image_bytes, thumbnail=None):
+        events.append("archive")
+        archived.append((digest, image_bytes, thumbnail))
+
+    monkeypatch.setattr(server, "get_model", lambda: model)
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "archive_upload", fake_archive_upload)
+    monkeypatch.setattr(server, "thumbnail_archived", lambda digest: False)
+
+    async def app(scope, receive, send):
+        async def recording_send(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                events.append("response")
+        await server.app(scope, receive, recording_send)
+
+    return server, TestClient(app), model, db, events, archived
+
+
+def upload_bytes() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), color="green").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def post_image(client, image_bytes):
+    return client.post(
+        "/api/predictions/predict",
+        files={"file": ("leaf.jpg", image_bytes, "image/jpeg")}
+    )
+
+
+def test_predict_records_hash_and_archives_after_response(route):
+    server, client, model, db, events, archived = route
+    image_bytes = upload_bytes()
+    digest = hashlib.sha256(image_bytes).hexdigest()
+
+    response = post_image(client, image_bytes)
+
+    assert response.status_code == 200
+    assert response.json()["image_sha256"] == digest
+    assert db.predictions.docs[0]["image_sha256"] == digest
+    assert model.thumbnail_sizes == [server.THUMBNAIL_SIZE]
+    assert events == ["insert", "response", "archive"]
+    assert archived[0][0] == digest
+    assert archived[0][1] == image_bytes
+    assert archived[0][2] is not None
+
+
+def test_predict_skips_thumbnail_when_already_archived(route, monkeypatch):
+    server, client, model, db, events, archived = route
+    monkeypatch.setattr(server, "thumbnail_archived", lambda digest: True)
+
+    response = post_image(client, upload_bytes())
+
+    assert response.status_code == 200
+    assert model.thumbnail_sizes == [None]
+    assert archived[0][2] is None